@@ -1,8 +1,9 @@
 from .async_tools import BinanceKlinesFetcher
-from .client import BinanceRestClient
+from .client import BinanceRestClient, get_client
 from .enums import Exchange
 from .exceptions import (
     BinanceAPIException,
+    BinanceBackpressureException,
     BinanceOrderException,
     BinanceOrderMinAmountException,
     BinanceOrderMinPriceException,
@@ -10,6 +11,8 @@ from .exceptions import (
     BinanceOrderUnknownSymbolException,
     BinanceRequestException,
 )
+from .rate_limits import RateLimiter
 from .settings import EXCHANGE_SETTINGS
+from .ws_client import BinanceWsClient
 
 __all__ = ["client", "enums", "exceptions", "settings"]
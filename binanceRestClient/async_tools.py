@@ -1,15 +1,165 @@
+from __future__ import annotations
+
 import asyncio
 import logging
-from datetime import datetime, timedelta, timezone
+from collections import deque
+from collections.abc import Mapping
+from datetime import timedelta
+from statistics import median
+from time import monotonic, time
 from timeit import default_timer as timer
 
 import aiohttp
+import numpy as np
+
+from binanceRestClient.exceptions import BinanceBackpressureException
+from binanceRestClient.rate_limits import RateLimiter
+
+try:
+    import httpx
+except ImportError:  # optional, only needed with `http2=True`
+    httpx = None
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # fall back to the (slower) stdlib json
+    from json import loads as _loads
+
+# ----------------- Concurrency limiting -----------------
+
+
+class AIMDLimiter:
+    """Adaptive concurrency limit with additive-increase/multiplicative-decrease.
+
+    The limit grows by `alpha` for every response whose latency stays within
+    `latency_factor` times the median of the last `window` samples, and is multiplied
+    by `beta` on errors or latency spikes, always staying within
+    [`min_limit`, `max_limit`]. `pause` holds back new requests, e.g. for a server
+    `Retry-After`. Use it as an async context manager around each request.
+    """
+
+    def __init__(
+        self,
+        initial: int = 16,
+        min_limit: int = 2,
+        max_limit: int = 64,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+        window: int = 32,
+        latency_factor: float = 2.0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.alpha = alpha
+        self.beta = beta
+        self.latency_factor = latency_factor
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._active = 0
+        self._waiting = 0
+        # created on first use, as it binds to the event loop it is used on
+        self._cond: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._paused_until = 0.0
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, error_traceback):
+        await self.release()
+
+    @property
+    def pending(self) -> int:
+        """Requests in flight or waiting for a slot."""
+        return self._active + self._waiting
+
+    def _condition(self) -> asyncio.Condition:
+        """The condition of the running loop, replaced (with the slot counts) when
+        the limiter is used on a new loop, e.g. by another `asyncio.run`."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._cond = asyncio.Condition()
+            self._loop = loop
+            self._active = self._waiting = 0
+        return self._cond
+
+    async def acquire(self) -> None:
+        cond = self._condition()
+        async with cond:
+            self._waiting += 1
+            try:
+                await cond.wait_for(lambda: self._active < int(self.limit))
+            finally:
+                self._waiting -= 1
+            self._active += 1
+        delay = self._paused_until - monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def release(self) -> None:
+        cond = self._condition()
+        async with cond:
+            self._active -= 1
+            # the limit may have grown, so wake up every waiter that now fits
+            cond.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        """Record a successful request `latency` (seconds) and adjust the limit."""
+        full = len(self._latencies) == self._latencies.maxlen
+        spike = full and latency > self.latency_factor * median(self._latencies)
+        self._latencies.append(latency)
+        if spike:
+            self.on_error()
+        else:
+            self.limit = min(self.limit + self.alpha, self.max_limit)
+
+    def on_error(self) -> None:
+        """Back off after an error, throttling or overload response."""
+        self.limit = max(self.limit * self.beta, self.min_limit)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back requests that have not started yet for `seconds`."""
+        self._paused_until = max(self._paused_until, monotonic() + seconds)
+
 
 # ----------------- Binance K-lines -----------------
 
+# column index and dtype of the kept fields of a Binance k-line
+KLINES_FIELDS: dict[str, tuple[int, type]] = {
+    "open_time": (0, np.int64),
+    "open": (1, np.float64),
+    "high": (2, np.float64),
+    "low": (3, np.float64),
+    "close": (4, np.float64),
+    "close_time": (6, np.int64),
+}
+# request weight of a single k-lines call
+KLINES_WEIGHT = 2
+
+# responses that signal throttling (429), an IP ban (418) or server overload
+BACKOFF_STATUSES = frozenset([418, 429, 500, 502, 503, 504])
+# fraction of the 1 minute request weight limit after which requests are paused
+WEIGHT_PAUSE_RATIO = 0.8
+
+TIMEOUT_ERRORS: tuple[type[Exception], ...] = (asyncio.TimeoutError,)
+if httpx is not None:
+    TIMEOUT_ERRORS += (httpx.TimeoutException,)
+
 
 class BinanceKlinesFetcher:
-    """Fetch Binance k-lines for multiple pairs asynchronously."""
+    """Fetch Binance k-lines for multiple pairs asynchronously.
+
+    The underlying `aiohttp.ClientSession` is created lazily and reused across
+    `fetch_pairs_klines` calls, so connections to the API are kept alive. With
+    `http2=True` an `httpx.AsyncClient` is used instead, multiplexing all requests as
+    HTTP/2 streams over a single connection (requires `httpx[http2]`). For
+    long-running programs use the fetcher as an async context manager, so the
+    session is closed on exit:
+
+        async with BinanceKlinesFetcher(pairs) as fetcher:
+            klines = await fetcher.fetch_pairs_klines()
+    """
 
     base_url = "https://api.binance.com/api/v3/klines"
 
@@ -23,14 +173,28 @@ class BinanceKlinesFetcher:
         pair_retries: int = 3,
         pair_timeout: int | None = None,
         init_backoff: float = 1.0,
+        max_concurrency: int = 64,
+        http2: bool = False,
+        weight_limit: int = 6000,
+        rate_limiter: RateLimiter | None = None,
+        backpressure: str = "queue",
+        max_queue: int = 0,
         logger: logging.Logger | None = None,
     ):
+        self._cls_name = self.__class__.__name__
+        if http2 and httpx is None:
+            raise ImportError("http2=True requires `httpx[http2]` to be installed.")
+        if backpressure not in ("queue", "fail"):
+            raise ValueError(f"Backpressure policy {backpressure} is not supported.")
         self.lgr = logger or logging.getLogger("BinanceKlinesFetcher")
         self.pairs = pairs
         self.lgr.info(
-            f"{self.cls_name}.__init__ - Will be getting klines for {self.pairs}"
+            f"{self._cls_name}.__init__ - Will be getting klines for {self.pairs}"
         )
         self.interval = interval
+        # the symbol and interval part of the urls, per (pairs, interval)
+        self._prefixes_cache: tuple[tuple, list[str]] | None = None
+        self._urls_cache: tuple[tuple[int, int], list[str], list[str]] | None = None
         # we need either fromTime and toTime or n_mins, check and raise if not:
         if not (fromTime and toTime) and not n_mins:
             raise ValueError("fromTime and toTime or n_mins are required.")
@@ -40,21 +204,103 @@ class BinanceKlinesFetcher:
         self.pair_retries = pair_retries
         self.pair_timeout = pair_timeout
         self.init_backoff = init_backoff
-        self.responses: dict[str, list[list[float]]] = {}
+        self.max_concurrency = max_concurrency
+        self.http2 = http2
+        self.weight_limit = weight_limit
+        # e.g. a `BinanceRestClient.rate_limiter`, to share the api weight budget
+        self.rate_limiter = rate_limiter
+        self._limiter = AIMDLimiter(
+            initial=min(16, max_concurrency), max_limit=max_concurrency
+        )
+        # with `backpressure="fail"`, give up on pairs requested while `max_queue`
+        # requests are already pending, instead of queueing them
+        self.backpressure = backpressure
+        self.max_queue = max_queue
+        self.backpressure_rejects = 0
+        self.responses: dict[str, dict[str, np.ndarray]] = {}
+        self._session: aiohttp.ClientSession | httpx.AsyncClient | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
+        # downloads in progress per url, shared by duplicate requests
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def __aenter__(self):
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, error_traceback):
+        await self.close()
 
     @property
     def cls_name(self) -> str:
-        return self.__class__.__name__
+        return self._cls_name
 
-    def create_klines_urls(self, start: int, end: int) -> list[str]:
-        """Create a list of k-lines URLs for multiple pairs."""
-        return [
-            (
-                f"{self.base_url}?symbol={p}&interval={self.interval}"
-                f"&startTime={start}&endTime={end}"
+    @property
+    def _session_closed(self) -> bool:
+        if self._session is None:
+            return True
+        return self._session.is_closed if self.http2 else self._session.closed
+
+    def _get_session(self) -> aiohttp.ClientSession | httpx.AsyncClient:
+        """Return the shared client session, creating it on first use. A session is
+        only reused on the event loop it was created on, e.g. not by a later
+        `asyncio.run`."""
+        loop = asyncio.get_running_loop()
+        if self._session_loop is not loop:
+            # the previous loop is gone or not ours, its session can't be closed here
+            self._session = None
+            self._session_loop = loop
+        if self._session_closed and self.http2:
+            self._session = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=1, max_keepalive_connections=1),
+                timeout=self.pair_timeout,
+            )
+        elif self._session_closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency * 2,
+                limit_per_host=self.max_concurrency,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+                enable_cleanup_closed=True,
             )
-            for p in [p.replace("-", "") for p in self.pairs]
-        ]
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.pair_timeout),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared client session."""
+        same_loop = self._session_loop is asyncio.get_running_loop()
+        if same_loop and not self._session_closed:
+            if self.http2:
+                await self._session.aclose()
+            else:
+                await self._session.close()
+        self._session = None
+
+    def _url_prefixes(self) -> list[str]:
+        """The symbol and interval part of each pair's url, rebuilt only when `pairs`
+        or `interval` change."""
+        key = (tuple(self.pairs), self.interval)
+        if self._prefixes_cache is None or self._prefixes_cache[0] != key:
+            prefixes = [
+                f"{self.base_url}?symbol={p.replace('-', '')}&interval={self.interval}"
+                for p in key[0]
+            ]
+            self._prefixes_cache = (key, prefixes)
+        return self._prefixes_cache[1]
+
+    def create_klines_urls(self, start: int, end: int) -> list[str]:
+        """Create a list of k-lines URLs for multiple pairs. The last list is reused
+        while the range and pairs stay the same, e.g. for fixed `fromTime` and
+        `toTime`."""
+        prefixes = self._url_prefixes()
+        cached = self._urls_cache
+        if cached is None or cached[0] != (start, end) or cached[1] is not prefixes:
+            urls = [f"{prefix}&startTime={start}&endTime={end}" for prefix in prefixes]
+            self._urls_cache = ((start, end), prefixes, urls)
+        return self._urls_cache[2]
 
     def get_backwards_range(self) -> tuple[int, int]:
         """Get the backwards range for the k-lines, provided the number of minutes."""
@@ -63,65 +309,138 @@ class BinanceKlinesFetcher:
                 return self.fromTime, self.toTime
             else:
                 raise ValueError("fromTime and toTime or n_mins are required.")
-        utcNow = datetime.now(tz=timezone.utc) - timedelta(milliseconds=500)
-        toTime = int(utcNow.timestamp() * 1000)
-        fromTime = int((utcNow - timedelta(minutes=self.n_mins)).timestamp() * 1000)
+        # keep a 500ms safety margin from the current time
+        toTime = int(time() * 1000) - 500
+        fromTime = toTime - int(self.n_mins * 60_000)
         return fromTime, toTime
 
+    async def _read(
+        self, session: aiohttp.ClientSession | httpx.AsyncClient, url: str
+    ) -> tuple[int, Mapping[str, str], bytes]:
+        """Download `url` and return the status, headers and raw body."""
+        if self.http2:
+            response = await session.get(url, timeout=self.pair_timeout)
+            return response.status_code, response.headers, response.content
+        async with session.get(url, timeout=self.pair_timeout) as response:
+            return response.status, response.headers, await response.read()
+
+    def _on_response(
+        self, status: int, headers: Mapping[str, str], latency: float
+    ) -> None:
+        """Feed a response to the concurrency limiter, pausing requests when Binance
+        asks to (`Retry-After`) or the used request weight nears `weight_limit`."""
+        if status in BACKOFF_STATUSES:
+            self._limiter.on_error()
+        else:
+            self._limiter.on_success(latency)
+        retry_after = headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            self._limiter.pause(int(retry_after))
+        used_weight = headers.get("X-MBX-USED-WEIGHT-1M")
+        if used_weight and int(used_weight) > WEIGHT_PAUSE_RATIO * self.weight_limit:
+            # the weight counter resets at the start of every minute
+            self._limiter.pause(60 - time() % 60)
+
     async def get_single_pair(
         self,
-        session: aiohttp.ClientSession,
+        session: aiohttp.ClientSession | httpx.AsyncClient,
         url: str,
         pair: str,
     ) -> None:
+        # single-flight: concurrent calls for the same url share one download
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_klines(session, url, pair))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        # a cancelled caller must not cancel the download of the others
+        self.responses[pair] = await asyncio.shield(task)
+
+    async def _fetch_klines(
+        self,
+        session: aiohttp.ClientSession | httpx.AsyncClient,
+        url: str,
+        pair: str,
+    ) -> dict[str, np.ndarray]:
+        """Download and parse the k-lines of `url`, retrying with a backoff."""
         for attempt in range(self.pair_retries):
             try:
-                async with session.get(url, timeout=self.pair_timeout) as response:
-                    resp = await response.json()
+                if self.backpressure == "fail" and (
+                    0 < self.max_queue <= self._limiter.pending
+                ):
+                    self.backpressure_rejects += 1
+                    raise BinanceBackpressureException()
+                if self.rate_limiter:
+                    await self.rate_limiter.async_wait_if_throttled(KLINES_WEIGHT)
+                async with self._limiter:
+                    _start = monotonic()
+                    status, headers, body = await self._read(session, url)
+                    self._on_response(status, headers, monotonic() - _start)
+                if status not in BACKOFF_STATUSES:
+                    resp = _loads(body)
                     break
-            except asyncio.TimeoutError:
                 self.lgr.warning(
-                    f"{self.cls_name}.get_single_pair - Timeout, retrying "
+                    f"{self._cls_name}._fetch_klines - Got status {status}, "
+                    f"retrying {attempt + 1}/{self.pair_retries} for {pair}"
+                )
+            except BinanceBackpressureException:
+                self.lgr.warning(
+                    f"{self._cls_name}._fetch_klines - Too many pending requests, "
+                    f"skipping {pair}"
+                )
+                resp = []
+                break
+            except TIMEOUT_ERRORS:
+                # timeouts are an overload signal too, back off like on a 503
+                self._limiter.on_error()
+                self.lgr.warning(
+                    f"{self._cls_name}._fetch_klines - Timeout, retrying "
                     f"{attempt + 1}/{self.pair_retries} for {pair}"
                 )
             except Exception as ex:
-                self.lgr.error(f"{self.cls_name}.get_single_pair - Exception: {ex}")
+                self.lgr.error(f"{self._cls_name}._fetch_klines - Exception: {ex}")
                 resp = []
                 break
             # add an exponential backoff for each retry
             await asyncio.sleep(self.init_backoff * (2**attempt))
         else:
             self.lgr.error(
-                f"{self.cls_name}.get_single_pair - Failed to get {pair} "
+                f"{self._cls_name}._fetch_klines - Failed to get {pair} "
                 f"after {self.pair_retries} retries."
             )
             resp = []
-        if isinstance(resp, dict):
-            resp = []
-        if resp:
-            # keep only the OHLC and 6th (close time) columns
-            resp = [
-                [float(r[1]), float(r[2]), float(r[3]), float(r[4]), r[6]] for r in resp
-            ]
-        self.responses[pair] = resp
+        if isinstance(resp, dict) or not resp:
+            return {}
+        # keep each column as a contiguous typed array, cast in one pass
+        rows = np.asarray(resp, dtype=object)
+        del resp  # release the parsed json before storing
+        return {
+            field: rows[:, col].astype(dtype)
+            for field, (col, dtype) in KLINES_FIELDS.items()
+        }
+
+    async def fetch_pairs_klines(self) -> dict[str, dict[str, np.ndarray]]:
+        """Fetch multiple pairs klines from Binance.
 
-    async def fetch_pairs_klines(self) -> dict[str, list[list[float]]]:
-        """Fetch multiple pairs klines from Binance."""
+        Each pair maps to its columns, `{"open", "high", "low", "close"}` as float64
+        and `{"open_time", "close_time"}` as int64 arrays, or to `{}` when no data
+        was received.
+        """
         self.responses = {}
         fromTime, toTime = self.get_backwards_range()
         urls = self.create_klines_urls(fromTime, toTime)
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            _timer_start = timer()
-            for i, p in enumerate(self.pairs):
-                task = asyncio.create_task(self.get_single_pair(session, urls[i], p))
-                tasks.append(task)
-
-            await asyncio.gather(*tasks)
-            self.lgr.info(
-                f"{self.cls_name}.fetch_pairs_klines - Download k-lines took: "
-                f"{timedelta(seconds=timer() - _timer_start)}"
-            )
+        session = self._get_session()
+        tasks = []
+        _timer_start = timer()
+        for p, url in zip(self.pairs, urls):
+            task = asyncio.create_task(self.get_single_pair(session, url, p))
+            tasks.append(task)
+
+        await asyncio.gather(*tasks)
+        self.lgr.info(
+            f"{self._cls_name}.fetch_pairs_klines - Download k-lines took: "
+            f"{timedelta(seconds=timer() - _timer_start)}"
+        )
         return self.responses
 
     def fill_missing_pairs(self) -> None:
@@ -130,26 +449,38 @@ class BinanceKlinesFetcher:
         try:
             eth_usdt = self.responses["ETH-USDT"]
         except KeyError:
-            self.lgr.error(f"{self.cls_name}.fill_missing_pairs - ETH-USDT is missing")
+            self.lgr.error(f"{self._cls_name}.fill_missing_pairs - ETH-USDT is missing")
             raise
+        if not eth_usdt:
+            # nothing to combine the existing pairs with
+            self.lgr.warning(
+                f"{self._cls_name}.fill_missing_pairs - ETH-USDT has no data"
+            )
+            return
         # find pairs with no data
-        q_l = len(eth_usdt)
+        q_l = len(eth_usdt["close"])
         missing_pairs = [p for p, v in self.responses.items() if not v]
+        # index the first pair with data for each base symbol
+        by_base: dict[str, str] = {}
+        for k, v in self.responses.items():
+            if v:
+                by_base.setdefault(k.split("-")[0], k)
         for p in missing_pairs:
-            base = p.split("-")[0]
             # find the pair with the same base
-            for k, v in self.responses.items():
-                if (base in k) and (k not in missing_pairs):
-                    # we combine the close prices of the existing pair with eth_usdt
-                    rows = v[:q_l] if len(v) > q_l else v  # prevent `out of range` err
-                    base_eth = [
-                        [round(r[0] / eth_usdt[i][0], 9), eth_usdt[i][1]]
-                        for i, r in enumerate(rows)
-                    ]
-                    self.responses[p] = base_eth
-                    break
+            k = by_base.get(p.split("-")[0])
+            if k is None:
+                continue
+            v = self.responses[k]
+            # we combine the close prices of the existing pair with eth_usdt
+            n = min(len(v["close"]), q_l)  # prevent `out of range` err
+            close = np.divide(v["close"][:n], eth_usdt["close"][:n])
+            np.round(close, 9, out=close)
+            self.responses[p] = {
+                "close": close,
+                "close_time": eth_usdt["close_time"][:n].copy(),
+            }
 
-    async def fetch_and_fill_klines(self) -> dict[str, list[list[float]]]:
+    async def fetch_and_fill_klines(self) -> dict[str, dict[str, np.ndarray]]:
         """Fetch and fill missing pairs klines."""
         await self.fetch_pairs_klines()
         self.fill_missing_pairs()
@@ -1,21 +1,63 @@
+from __future__ import annotations
+
+import atexit
 import hashlib
 import hmac
 import logging
+import os
 import platform
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from copy import deepcopy
 from datetime import datetime
+from functools import lru_cache
 from operator import itemgetter
-from time import time
+from pathlib import Path
+from time import monotonic, time_ns
 from typing import Any
+from urllib.parse import urlencode
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from binanceRestClient.exceptions import (
     AlreadyStoppedError,
     BinanceAPIException,
+    BinanceBackpressureException,
     BinanceRequestException,
 )
+from binanceRestClient.rate_limits import RateLimiter
 from binanceRestClient.settings import EXCHANGE_SETTINGS, Exchange
 
+try:
+    import httpx
+except ImportError:  # optional, only needed with `transport="httpx"`
+    httpx = None
+
+try:
+    import ijson
+except ImportError:  # optional, only needed by `get_symbol_info(stream=True)`
+    ijson = None
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:  # fall back to the (slower) stdlib json
+    import json
+
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+
 lgr = logging.getLogger(__name__)
 
 __app_name__: str = "cl-binance-rest-api"
@@ -28,14 +70,56 @@ def get_user_agent(name: str, version: str) -> str:
 
 user_agent = get_user_agent(__app_name__, __version__)
 
+# HTTP methods dispatched by `BinanceRestClient._request`
+HTTP_METHODS = ("get", "post", "put", "delete")
+# HTTP client libraries the REST session can be built with
+TRANSPORTS = ("requests", "httpx")
+# what to do with a request once `max_queue` requests are already pending
+BACKPRESSURE_POLICIES = ("queue", "fail")
+# suggested `exchange_info_cache_dir`, to persist `exchangeInfo` across restarts
+EXCHANGE_INFO_CACHE_DIR = Path.home() / ".cache" / "binance_rest_client"
+
+# approximate request weight of api paths as (with `symbol`, without `symbol`);
+# paths not listed weigh 1
+REQUEST_WEIGHTS = {
+    "exchangeInfo": (20, 20),
+    "depth": (5, 5),
+    "historicalTrades": (25, 25),
+    "klines": (2, 2),
+    "ticker": (4, 4),
+    "ticker/price": (2, 4),
+    "ticker/24hr": (2, 80),
+    "ticker/bookTicker": (2, 4),
+    "userDataStream": (2, 2),
+}
+
+
+def request_weight(path: str, params: dict | None = None) -> int:
+    """Approximate request weight of a call to the api `path` with `params`."""
+    weights = REQUEST_WEIGHTS.get(path)
+    if weights is None:
+        return 1
+    return weights[0] if params and "symbol" in params else weights[1]
+
+
+@lru_cache(maxsize=1024)
+def _build_url(uri: str, params: tuple) -> str:
+    """Encode `params` into `uri` once, for requests repeated with the same params."""
+    return f"{uri}?{urlencode(params)}"
+
 
 def currentTsMillis() -> int:
-    return int(round(time() * 1000))
+    return time_ns() // 1_000_000
 
 
 class BinanceRestClient:
     API_VERSION = "v3"
     WALLET_API_VERSION = "v1"
+    # seconds a successful GET response is served from cache, per endpoint path;
+    # `exchangeInfo` has its own cache, see `get_exchange_info`
+    CACHE_TTL = {"ticker/price": 1, "ticker/bookTicker": 1}
+    # `batch` ops with a multi-symbol endpoint form
+    BATCHABLE_OPS = ("ticker", "24hr_ticker")
 
     def __init__(
         self,
@@ -44,14 +128,35 @@ class BinanceRestClient:
         requests_params: dict | None = None,
         exchange: str | None = Exchange.BINANCE,
         debug: bool = False,
+        exchange_info_ttl: float = 60,
+        exchange_info_cache_dir: str | os.PathLike | None = None,
+        throttle: bool = False,
+        transport: str = "requests",
+        backpressure: str = "queue",
+        max_queue: int = 0,
     ) -> None:
-        """Binance REST API Client constructor"""
+        """Binance REST API Client constructor. Set `transport="httpx"` to send the
+        requests over a multiplexed HTTP/2 `httpx.Client` (requires `httpx[http2]`).
+
+        With `backpressure="fail"`, a request made while `max_queue` requests are
+        already pending (waiting on the rate limiter or in flight) is rejected at once
+        with a `BinanceBackpressureException`, instead of queueing behind them.
+        `max_queue=0` never rejects.
+        """
+        self._cls_name = self.__class__.__name__
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Transport {transport} is not supported.")
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Backpressure policy {backpressure} is not supported.")
+        if transport == "httpx" and httpx is None:
+            raise ImportError('transport="httpx" requires `httpx[http2]` installed.')
+        self.transport = transport
         self.sigterm = False
         self.session = None
         if self.sigterm is False:
             if exchange not in Exchange:
                 lgr.critical(
-                    f"{self.cls_name}.__init__ - Exchange {exchange} is not "
+                    f"{self._cls_name}.__init__ - Exchange {exchange} is not "
                     f"supported."
                 )
                 raise ValueError(f"Exchange {exchange} is not supported.")
@@ -60,20 +165,41 @@ class BinanceRestClient:
         self.api_url = EXCHANGE_SETTINGS[self.exchange].api_base_uri
         self.api_key = api_key
         self.api_secret = api_secret
+        self._hmac_template = self._init_hmac()
         self.requests_params = requests_params
         self.resp = None
+        self.exchange_info_ttl = exchange_info_ttl
+        self.exchange_info_cache_dir = exchange_info_cache_dir
+        # (expiry, raw response, symbol index, ETag) per `exchangeInfo` params
+        self._exchange_info_cache: dict[
+            frozenset, tuple[float, dict, dict, str | None]
+        ] = {}
+        self._cache: dict[tuple, tuple[float, dict | list]] = {}
+        self._cache_ttl = dict(self.CACHE_TTL)
         self.session = self._init_session()
+        # bind the session's request methods once, instead of on every request
+        self._dispatch = {m: getattr(self.session, m) for m in HTTP_METHODS}
         self.ts_offset = 0
+        # with `throttle`, wait client-side instead of exceeding the api rate limits
+        self.rate_limiter: RateLimiter | None = None
+        self.backpressure = backpressure
+        self.max_queue = max_queue
+        self.backpressure_rejects = 0
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        if throttle:
+            self.rate_limiter = RateLimiter()
+            self.load_rate_limits()
 
     @property
     def cls_name(self):
-        return self.__class__.__name__
+        return self._cls_name
 
     def __enter__(self):
-        lgr.debug(f"{self.cls_name}.__enter__ - Entering `with-context` ...")
+        lgr.debug(f"{self._cls_name}.__enter__ - Entering `with-context` ...")
         if self.sigterm is True:
             info = (
-                f"{self.cls_name}.__enter__ - Instance has already"
+                f"{self._cls_name}.__enter__ - Instance has already"
                 f" been stopped and cannot be used."
             )
             lgr.critical(info)
@@ -81,26 +207,64 @@ class BinanceRestClient:
         return self
 
     def __exit__(self, exc_type, exc_value, error_traceback):
-        lgr.debug(f"{self.cls_name}.__exit__ - Leaving `with-context` ...")
+        lgr.debug(f"{self._cls_name}.__exit__ - Leaving `with-context` ...")
         self.stop_manager()
         if exc_type:
             lgr.critical(
-                f"{self.cls_name}.__exit__ - An exception occurred: {exc_type} - "
+                f"{self._cls_name}.__exit__ - An exception occurred: {exc_type} - "
                 f"{exc_value} - {error_traceback}"
             )
 
-    def _init_session(self) -> requests.Session:
-        """Initialize requests session"""
-        session = requests.session()
+    def _init_session(self) -> requests.Session | httpx.Client:
+        """Initialize requests session with a pooled, retrying HTTPS adapter, or an
+        HTTP/2 `httpx.Client` for the httpx transport"""
+        if self.transport == "httpx":
+            limits = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            session = httpx.Client(
+                http2=True,
+                limits=limits,
+                timeout=10.0,
+                transport=httpx.HTTPTransport(http2=True, limits=limits, retries=3),
+            )
+        else:
+            session = requests.Session()
+            retries = Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"]),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=32, pool_maxsize=64, max_retries=retries
+            )
+            session.mount("https://", adapter)
         session.headers.update(
             {
                 "Accept": "application/json",
+                # compressed responses, incl. `br` when `brotli` is installed
+                "Accept-Encoding": requests.utils.DEFAULT_ACCEPT_ENCODING,
                 "User-Agent": user_agent,
                 "X-MBX-APIKEY": str(self.api_key),
             }
         )
         return session
 
+    def _init_hmac(self) -> hmac.HMAC | None:
+        """Key an HMAC-SHA256 template with the api secret, to be copied per
+        signature instead of re-keyed."""
+        if not self.api_secret:
+            return None
+        return hmac.new(self.api_secret.encode("utf-8"), b"", hashlib.sha256)
+
+    def set_credentials(self, api_key: str, api_secret: str) -> None:
+        """Rotate the api credentials in place. The session, and the pooled
+        connections it holds, are kept."""
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self._hmac_template = self._init_hmac()
+        self.session.headers["X-MBX-APIKEY"] = str(api_key)
+
     def _create_api_uri(self, path: str, signed=True, version=API_VERSION) -> str:
         # v = self.PRIVATE_API_VERSION if signed else version
         return self.api_url + "/" + version + "/" + path
@@ -130,18 +294,17 @@ class BinanceRestClient:
 
     def _generate_signature(self, data: dict[str, Any]) -> str:
         """Generate request signature."""
-        if not self.api_secret:
+        if not self._hmac_template:
             raise BinanceAPIException("Api secret not configured")
         order_data = self._order_params(data)
-        query_string = "&".join(["{}={}".format(d[0], d[1]) for d in order_data])
-        m = hmac.new(
-            self.api_secret.encode("utf-8"),
-            query_string.encode("utf-8"),
-            hashlib.sha256,
-        )
+        query_string = urlencode(order_data)
+        m = self._hmac_template.copy()
+        m.update(query_string.encode("utf-8"))
         return m.hexdigest()
 
-    def _handle_response(self, throw_exception=True) -> dict:
+    def _handle_response(
+        self, response: requests.Response | httpx.Response, throw_exception=True
+    ) -> dict:
         """
         Handle API responses from the Binance server.
         Raises the appropriate exceptions when necessary; otherwise, returns the
@@ -149,12 +312,12 @@ class BinanceRestClient:
 
         """
         if throw_exception is True:
-            if not (200 <= self.response.status_code < 300):
-                raise BinanceAPIException(self.response)
+            if not (200 <= response.status_code < 300):
+                raise BinanceAPIException(response)
         try:
-            return self.response.json()
+            return _loads(response.content)
         except ValueError:
-            raise BinanceRequestException("Invalid Response: %s" % self.response.text)
+            raise BinanceRequestException("Invalid Response: %s" % response.text)
 
     def _request(
         self,
@@ -165,31 +328,74 @@ class BinanceRestClient:
         throw_exception=True,
         **kwargs,
     ) -> dict:
+        response = self._request_raw(method, uri, signed, force_params, **kwargs)
+        return self._handle_response(response, throw_exception=throw_exception)
+
+    def _request_raw(
+        self,
+        method: str,
+        uri: str,
+        signed: bool,
+        force_params=False,
+        weight=1,
+        **kwargs,
+    ) -> requests.Response | httpx.Response:
+        """Send the request and return the raw response, without parsing its body.
+
+        The response is also kept as `self.response`, the last response of the
+        client. Code handling it should use the returned one, as other threads
+        sharing the client may replace `self.response` meanwhile.
+        """
+        self._check_stopped("_request()")
+        with self._track_pending():
+            return self._send(method, uri, signed, force_params, weight, **kwargs)
+
+    @contextmanager
+    def _track_pending(self) -> Iterator[None]:
+        """Count a request as pending while it is sent, rejecting it with
+        `BinanceBackpressureException` when `max_queue` requests already are."""
+        with self._pending_lock:
+            if self.backpressure == "fail" and 0 < self.max_queue <= self._pending:
+                self.backpressure_rejects += 1
+                raise BinanceBackpressureException()
+            self._pending += 1
+        try:
+            yield
+        finally:
+            with self._pending_lock:
+                self._pending -= 1
+
+    def _check_stopped(self, caller: str) -> None:
         if self.sigterm is True:
             info = (
-                f"{self.cls_name}._request() - instance has already been stopped and "
+                f"{self._cls_name}.{caller} - instance has already been stopped and "
                 "cannot be used."
             )
             lgr.critical(info)
             raise AlreadyStoppedError(info)
 
-        # if an api_secret and api_key are provided update & reset session
-        try:
-            api_key = kwargs.pop("api_key")
-            api_secret = kwargs.pop("api_secret")
-        except KeyError:
-            api_key = None
-            api_secret = None
+    def _send(
+        self,
+        method: str,
+        uri: str,
+        signed: bool,
+        force_params: bool,
+        weight: int,
+        **kwargs,
+    ) -> requests.Response | httpx.Response:
+        if self.rate_limiter:
+            # wait before signing, so the timestamp isn't stale once sent
+            self.rate_limiter.wait_if_throttled(weight)
+
+        # if an api_secret and api_key are provided update the session headers
+        api_key = kwargs.pop("api_key", None)
+        api_secret = kwargs.pop("api_secret", None)
         if api_key and api_secret:
             lgr.debug(
-                f"{self.cls_name}._request() - Got `api_key` and `api_secret` via "
-                f"`**kwargs`, resetting request session."
+                f"{self._cls_name}._request() - Got `api_key` and `api_secret` via "
+                f"`**kwargs`, updating request session."
             )
-            self.api_key = api_key
-            self.api_secret = api_secret
-            if self.session:
-                self.session.close()
-            self.session = self._init_session()
+            self.set_credentials(api_key, api_secret)
 
         # set default requests timeout
         kwargs["timeout"] = 10
@@ -199,40 +405,43 @@ class BinanceRestClient:
             kwargs.update(self.requests_params)
 
         data = kwargs.get("data", None)
-        if data and isinstance(data, dict):
-            kwargs["data"] = data
-
+        if isinstance(data, dict):
             # find any requests params passed and apply them
-            if "requests_params" in kwargs["data"]:
+            if "requests_params" in data:
                 # merge requests params into kwargs
-                kwargs.update(kwargs["data"].pop("requests_params"))
+                kwargs.update(data.pop("requests_params"))
+            # Remove any arguments with values of None.
+            data = {k: v for k, v in data.items() if v is not None}
+            kwargs["data"] = data
 
         if signed:
             # generate signature
-            kwargs["data"]["timestamp"] = int(currentTsMillis() + self.ts_offset)
-            kwargs["data"]["signature"] = self._generate_signature(kwargs["data"])
-
-        # sort get and post params to match signature order
-        if data:
-            # sort post params
-            kwargs["data"] = self._order_params(kwargs["data"])
-            # Remove any arguments with values of None.
-            null_args = [
-                i for i, (key, value) in enumerate(kwargs["data"]) if value is None
-            ]
-            for i in reversed(null_args):
-                del kwargs["data"][i]
-
-        # if get request assign data array to params value for requests lib
-        if data and (method == "get" or force_params):
-            kwargs["params"] = "&".join(
-                "%s=%s" % (data[0], data[1]) for data in kwargs["data"]
-            )
+            data["timestamp"] = int(currentTsMillis() + self.ts_offset)
+            data["signature"] = self._generate_signature(data)
+            # sort params to match signature order, only signed endpoints need it
+            data = kwargs["data"] = self._order_params(data)
+
+        # if get request assign data to params value for requests lib; httpx only
+        # takes form data on post/put, so it always gets the params in the query
+        if "data" in kwargs and (
+            method == "get" or force_params or self.transport == "httpx"
+        ):
+            if data and signed:
+                # signed params keep the exact encoding and order they were signed
+                kwargs["params"] = urlencode(data)
+            elif data and all(type(v) in (str, int) for v in data.values()):
+                # only exact str/int values, as 1, 1.0 and True share a cache key
+                uri = _build_url(uri, tuple(data.items()))
+            elif data:  # other values, e.g. floats or lists, the session encodes
+                kwargs["params"] = data
             del kwargs["data"]
 
-        self.response = getattr(self.session, method)(uri, **kwargs)
-
-        return self._handle_response(throw_exception=throw_exception)
+        try:
+            send = self._dispatch[method]
+        except KeyError:
+            raise ValueError(f"Unsupported HTTP method `{method}`.")
+        self.response = send(uri, **kwargs)
+        return self.response
 
     def _request_api(
         self,
@@ -243,11 +452,36 @@ class BinanceRestClient:
         throw_exception=True,
         **kwargs,
     ) -> dict:
+        self._check_stopped("_request_api()")
         uri = self._create_api_uri(path, signed, version)
 
-        return self._request(
-            method, uri, signed, throw_exception=throw_exception, **kwargs
-        )
+        ttl = self._cache_ttl.get(path) if method == "get" and not signed else None
+        if ttl:
+            try:
+                key = (version, path, frozenset((kwargs.get("data") or {}).items()))
+            except TypeError:  # unhashable params are not cached
+                ttl = None
+            else:
+                cached = self._cache.get(key)
+                if cached and monotonic() - cached[0] < ttl:
+                    return deepcopy(cached[1])
+
+        kwargs["weight"] = request_weight(path, kwargs.get("data"))
+        response = self._request_raw(method, uri, signed, **kwargs)
+        res = self._handle_response(response, throw_exception=throw_exception)
+        if ttl and 200 <= response.status_code < 300:
+            self._cache[key] = (monotonic(), deepcopy(res))
+        return res
+
+    def invalidate_cache(self, path: str | None = None) -> None:
+        """Drop cached GET responses, either all of them or only those of `path`."""
+        if path in (None, "exchangeInfo"):
+            self._exchange_info_cache.clear()
+        if path is None:
+            self._cache.clear()
+            return
+        for key in [k for k in self._cache if k[1] == path]:
+            del self._cache[key]
 
     def _request_wallet_api(
         self,
@@ -280,26 +514,135 @@ class BinanceRestClient:
     def _delete(self, path, signed=False, version=API_VERSION, **kwargs) -> dict:
         return self._request_api("delete", path, signed, version, **kwargs)
 
-    def get_exchange_info(self, **params) -> dict:
-        """Current exchange trading rules and symbol information"""
-        return self._get("exchangeInfo", data=params)
+    def get_exchange_info(self, refresh: bool = False, **params) -> dict:
+        """Current exchange trading rules and symbol information. Responses are
+        cached per `params` for `exchange_info_ttl` seconds, unless `refresh` is set.
+        The cached dict is shared between calls and should not be mutated.
 
-    def get_symbol_info(self, symbol) -> dict | None:
-        """Current exchange trading rules and symbol information"""
-        res = self._get("exchangeInfo")
+        Expired responses are revalidated with `If-None-Match`, so an unchanged
+        `exchangeInfo` (304) is neither downloaded nor parsed again. With
+        `exchange_info_cache_dir` set, the full response and its ETag are also kept on
+        disk and reused after a restart.
+        """
+        self._check_stopped("get_exchange_info()")
+        params = self._encode_symbols(params, keys=("symbols", "permissions"))
+        try:
+            key: frozenset | None = frozenset(params.items())
+        except TypeError:  # other unhashable params are sent, but not cached
+            key = None
+        cached = self._exchange_info_cache.get(key) if key is not None else None
+        if cached is None and not params and self.exchange_info_cache_dir:
+            cached = self._load_exchange_info()
+        if not refresh and cached and monotonic() < cached[0]:
+            return cached[1]
+
+        kwargs: dict[str, Any] = {"data": params}
+        if cached and cached[3]:
+            kwargs["headers"] = {"If-None-Match": cached[3]}
+        response = self._request_raw(
+            "get",
+            self._create_api_uri("exchangeInfo"),
+            signed=False,
+            weight=request_weight("exchangeInfo"),
+            **kwargs,
+        )
+        not_modified = bool(cached) and response.status_code == 304
+        if not_modified:
+            res, by_symbol = cached[1], cached[2]
+        else:
+            res = self._handle_response(response)
+            by_symbol = {s["symbol"]: s for s in res.get("symbols", ())}
+        # a 304 may omit the ETag, the cached one then stays valid
+        etag = response.headers.get("ETag") or (cached[3] if not_modified else None)
+        if key is not None:
+            self._exchange_info_cache[key] = (
+                monotonic() + self.exchange_info_ttl,
+                res,
+                by_symbol,
+                etag,
+            )
+        if not (params or not_modified) and self.exchange_info_cache_dir and etag:
+            self._save_exchange_info(res, etag)
+        return res
 
-        for item in res["symbols"]:
-            if item["symbol"] == symbol.upper():
-                return item
+    def _exchange_info_path(self) -> Path:
+        return (
+            Path(self.exchange_info_cache_dir)
+            / f"exchange_info_{self.exchange.value}.json"
+        )
 
+    def _load_exchange_info(self) -> tuple[float, dict, dict, str | None] | None:
+        """Load the persisted `exchangeInfo`, as an already expired cache entry."""
+        try:
+            persisted = _loads(self._exchange_info_path().read_bytes())
+            res, etag = persisted["exchangeInfo"], persisted["etag"]
+        except (OSError, ValueError, KeyError):
+            return None
+        return 0.0, res, {s["symbol"]: s for s in res.get("symbols", ())}, etag
+
+    def _save_exchange_info(self, res: dict, etag: str) -> None:
+        """Persist the full `exchangeInfo` and its ETag, replacing the file atomically."""
+        path = self._exchange_info_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(_dumps({"etag": etag, "exchangeInfo": res}))
+            tmp.replace(path)
+        except OSError as ex:
+            lgr.warning(f"{self._cls_name} - Could not persist exchangeInfo: {ex}")
+
+    def load_rate_limits(self) -> dict[str, tuple[int, int]]:
+        """Configure the client-side rate limiter from `exchangeInfo.rateLimits`.
+        Returns the tracked limits as {name: (interval seconds, limit)}."""
+        if self.rate_limiter is None:
+            self.rate_limiter = RateLimiter()
+        self.rate_limiter.load(self.get_exchange_info()["rateLimits"])
+        return self.rate_limiter.limits
+
+    def get_symbol_info(self, symbol, stream: bool = False) -> dict | None:
+        """Current exchange trading rules and symbol information. Symbols are looked
+        up in the index of the cached `exchangeInfo`.
+
+        With `stream` and a cold cache, the response is instead parsed incrementally
+        (requires `ijson` and the requests transport) and the download stops at the
+        matching symbol, which suits one-shot lookups. The result isn't cached.
+        """
+        symbol = symbol.upper()
+        cached = self._exchange_info_cache.get(frozenset())
+        cold = cached is None or monotonic() >= cached[0]
+        if stream and cold and ijson is not None and self.transport == "requests":
+            return self._stream_symbol_info(symbol)
+        self.get_exchange_info()
+        return self._exchange_info_cache[frozenset()][2].get(symbol)
+
+    def _stream_symbol_info(self, symbol: str) -> dict | None:
+        """Scan the `exchangeInfo` symbols as they are downloaded, up to `symbol`."""
+        response = self._request_raw(
+            "get",
+            self._create_api_uri("exchangeInfo"),
+            signed=False,
+            weight=request_weight("exchangeInfo"),
+            stream=True,
+        )
+        with response:
+            if not (200 <= response.status_code < 300):
+                raise BinanceAPIException(response)
+            # let urllib3 undo the gzip/deflate encoding of the raw stream
+            response.raw.decode_content = True
+            for info in ijson.items(response.raw, "symbols.item", use_float=True):
+                if info["symbol"] == symbol:
+                    return info
         return None
 
+    def invalidate_symbol_cache(self) -> None:
+        """Drop the cached `exchangeInfo`, so the next call re-fetches it."""
+        self._exchange_info_cache.clear()
+
     def ping(self) -> bool:
-        """Test connectivity to the Rest API. Returns empty dictionary {}"""
-        res = self._get("ping")
-        if res == {}:
-            return True
-        return False
+        """Test connectivity to the Rest API. The endpoint returns an empty dictionary
+        {}, so only the status code is checked and the body is not parsed."""
+        response = self._request_raw("get", self._create_api_uri("ping"), signed=False)
+        return 200 <= response.status_code < 300
 
     def get_server_time(self) -> int:
         """Returns the current server time
@@ -312,17 +655,31 @@ class BinanceRestClient:
             return res["serverTime"]
         return 0
 
+    @staticmethod
+    def _encode_symbols(
+        params: dict[str, Any], keys: tuple[str, ...] = ("symbols",)
+    ) -> dict[str, Any]:
+        """Encode a `symbols` list (or the lists of other `keys`) as the JSON array
+        Binance expects, so several symbols are fetched in a single request."""
+        for key in keys:
+            values = params.get(key)
+            if isinstance(values, (list, tuple)):
+                params[key] = _dumps(list(values))
+        return params
+
     def get_ticker(self, **params) -> dict | list:
-        """Latest price for a symbol or symbols."""
-        return self._get("ticker/price", data=params)
+        """Latest price for a symbol or symbols. Pass `symbols` as a list to get
+        several symbols in a single request."""
+        return self._get("ticker/price", data=self._encode_symbols(params))
 
     def get_all_tickers(self) -> list[dict]:
         """Latest price for all symbols."""
         return self._get("ticker/price")
 
     def get_24hr_ticker(self, **params) -> dict:
-        """24 hour price change statistics."""
-        return self._get("ticker/24hr", data=params)
+        """24 hour price change statistics. Pass `symbols` as a list to get several
+        symbols in a single request."""
+        return self._get("ticker/24hr", data=self._encode_symbols(params))
 
     def get_orderbook_tickers(self) -> dict:
         """Best price/qty on the order book for all symbols."""
@@ -395,6 +752,80 @@ class BinanceRestClient:
         )
         return kline[0][0]
 
+    def kline_fetcher(
+        self, symbol: str, interval: str, limit: int = 500
+    ) -> Callable[[], list[list]]:
+        """Return a no-argument callable fetching the latest `get_klines` of `symbol`.
+
+        The url is encoded once and the response is neither cached nor kept in
+        `self.response`, which makes it the cheaper option for tight polling loops:
+            fetch = client.kline_fetcher("BTCUSDT", "1m", limit=10)
+            klines = fetch()
+        """
+        params = (("symbol", symbol), ("interval", interval), ("limit", limit))
+        url = f"{self._create_api_uri('klines', False)}?{urlencode(params)}"
+        weight = request_weight("klines")
+        get = self._dispatch["get"]
+
+        def fetch() -> list[list]:
+            self._check_stopped("kline_fetcher()")
+            with self._track_pending():
+                if self.rate_limiter:
+                    self.rate_limiter.wait_if_throttled(weight)
+                response = get(url, timeout=10)
+            if not (200 <= response.status_code < 300):
+                raise BinanceAPIException(response)
+            return _loads(response.content)
+
+        return fetch
+
+    def batch(self, ops: list[tuple[str, dict]]) -> list:
+        """Run several read calls, each given as a `(name, params)` tuple, where
+        `name` is a `get_*` method name without the `get_` prefix, e.g.
+            [("exchange_info", {}), ("ticker", {"symbol": "BTCUSDT"}),
+             ("klines", {"symbol": "BTCUSDT", "interval": "1m", "limit": 10})]
+
+        Ops in `BATCHABLE_OPS` that only take a `symbol` or a `symbols` list are
+        merged into a single multi-symbol request per op name. All other ops, e.g.
+        `symbols` already encoded as a JSON array string, are sent in order over the
+        shared session. Returns the results in the order of `ops`.
+        """
+        results: list = [None] * len(ops)
+        groups: dict[str, list[int]] = {}
+        for i, (name, params) in enumerate(ops):
+            method = self._batch_method(name)
+            symbol_only = params.keys() == {"symbol"} or (
+                params.keys() == {"symbols"}
+                and isinstance(params["symbols"], (list, tuple))
+            )
+            if name in self.BATCHABLE_OPS and symbol_only:
+                groups.setdefault(name, []).append(i)
+            else:
+                results[i] = method(**params)
+
+        for name, idxs in groups.items():
+            op_symbols = [
+                [ops[i][1]["symbol"]] if "symbol" in ops[i][1] else ops[i][1]["symbols"]
+                for i in idxs
+            ]
+            symbols = list(dict.fromkeys(s for syms in op_symbols for s in syms))
+            res = self._batch_method(name)(symbols=symbols)
+            by_symbol = {r["symbol"]: r for r in res}
+            for i, syms in zip(idxs, op_symbols):
+                if "symbol" in ops[i][1]:
+                    results[i] = by_symbol.get(syms[0])
+                else:
+                    results[i] = [by_symbol[s] for s in syms if s in by_symbol]
+        return results
+
+    def _batch_method(self, name: str):
+        """Resolve a `batch` op name to the bound `get_*` client method. Other
+        methods, e.g. `stop` or `stream_close`, change state and are not batchable."""
+        method = getattr(self, f"get_{name}", None)
+        if name.startswith("_") or not callable(method):
+            raise ValueError(f"Unknown batch operation `{name}`.")
+        return method
+
     def req_weight_cost(self, new_req=False) -> dict:
         """Get the weight cost of the last request. If `new_req` is True, then
         make a new request to 'exchangeInfo' and update the weight cost.
@@ -402,10 +833,11 @@ class BinanceRestClient:
             weight: int
             timestamp: float
             status_code: int
+            backpressure_rejects: int, requests rejected client-side so far
         """
-        resp_status = {}
+        resp_status = {"backpressure_rejects": self.backpressure_rejects}
         if new_req:
-            self.get_exchange_info()
+            self.get_exchange_info(refresh=True)
         resp_status["weight"] = self.response.headers.get("X-MBX-USED-WEIGHT", 0)
         resp_status["status_code"] = self.response.status_code
         try:
@@ -428,12 +860,14 @@ class BinanceRestClient:
                 response status code is not 200. Defaults to True.
 
         """
+        # sent in the query string, whose encoded url is cached per listen key
         params = {"listenKey": listenKey}
         return self._delete(
             "userDataStream",
             False,
             version=self.API_VERSION,
             data=params,
+            force_params=True,
             throw_exception=throw_exception,
             **kwargs,
         )
@@ -477,19 +911,21 @@ class BinanceRestClient:
         Returns:
             dict: The response, which should be an empty dict.
         """
+        # sent in the query string, whose encoded url is cached per listen key
         params = {"listenKey": listenKey}
         return self._put(
             "userDataStream",
             False,
             version=self.API_VERSION,
             data=params,
+            force_params=True,
             throw_exception=throw_exception,
             **kwargs,
         )
 
     def stop(self) -> bool:
         """Stop the BinanceRestManager."""
-        lgr.info(f"{self.cls_name}.stop() - Stopping BinanceRestManager ...")
+        lgr.info(f"{self._cls_name}.stop() - Stopping BinanceRestManager ...")
         self.sigterm = True
         if self.session:
             self.session.close()
@@ -498,3 +934,41 @@ class BinanceRestClient:
     def all_coins_info(self) -> list[dict] | dict:
         """Get all coins information. This is a `wallet` endpoint."""
         return self._request_wallet_api("get", "capital/config/getall", data={})
+
+
+# process-wide clients shared by `get_client`, per (exchange, api key), with the
+# kwargs they were created with
+_CLIENTS: dict[tuple[Exchange, str | None], tuple[BinanceRestClient, dict]] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_client(exchange: str = Exchange.BINANCE, **kwargs) -> BinanceRestClient:
+    """Get the shared `BinanceRestClient` of `exchange`, creating it on first use.
+
+    Reusing one client per exchange and api key keeps its connection pool (and TLS
+    sessions) alive across calls. Later calls must pass the same `kwargs` as the one
+    creating the client, or a ValueError is raised; stopped clients are replaced.
+    """
+    if exchange not in Exchange:
+        raise ValueError(f"Exchange {exchange} is not supported.")
+    key = (Exchange(exchange), kwargs.get("api_key"))
+    with _CLIENTS_LOCK:
+        client, client_kwargs = _CLIENTS.get(key, (None, None))
+        if client is None or client.sigterm:
+            client = BinanceRestClient(exchange=key[0], **kwargs)
+            _CLIENTS[key] = (client, kwargs)
+        elif kwargs != client_kwargs:
+            raise ValueError(
+                f"The shared client of {key[0].value} was created with other "
+                "arguments, use `BinanceRestClient` for a separate one."
+            )
+        return client
+
+
+@atexit.register
+def _stop_clients() -> None:
+    with _CLIENTS_LOCK:
+        for client, _ in _CLIENTS.values():
+            if not client.sigterm:
+                client.stop()
+        _CLIENTS.clear()
@@ -3,11 +3,12 @@ from enum import Enum, EnumMeta
 
 class MetaEnum(EnumMeta):
     def __contains__(cls, item):
+        if isinstance(item, cls):
+            return True
         try:
-            cls(item)
-        except ValueError:
+            return item in cls._value2member_map_
+        except TypeError:  # unhashable items can't be member values
             return False
-        return True
 
 
 class BaseStrEnum(str, Enum, metaclass=MetaEnum):
@@ -18,6 +18,18 @@ class BinanceAPIException(Exception):
         return "APIError(code=%s): %s" % (self.code, self.message)
 
 
+class BinanceBackpressureException(BinanceAPIException):
+    """Raised when a request is rejected client-side, because too many requests are
+    already pending and the client's backpressure policy is `fail`."""
+
+    def __init__(self, message="client-side backpressure"):
+        self.code = 0
+        self.message = message
+        self.status_code = 429
+        self.response = None
+        self.request = None
+
+
 class BinanceRequestException(Exception):
     def __init__(self, message):
         self.message = message
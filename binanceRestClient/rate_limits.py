@@ -0,0 +1,107 @@
+import asyncio
+import threading
+from collections import deque
+from time import monotonic, sleep
+
+# length of the Binance `rateLimits` intervals, in seconds
+INTERVAL_SECONDS = {"SECOND": 1, "MINUTE": 60, "HOUR": 3_600, "DAY": 86_400}
+
+# Binance spot defaults, used until the limits are loaded from `exchangeInfo`
+DEFAULT_RATE_LIMITS = [
+    {
+        "rateLimitType": "REQUEST_WEIGHT",
+        "interval": "MINUTE",
+        "intervalNum": 1,
+        "limit": 6000,
+    },
+]
+
+
+class RateLimiter:
+    """Client-side sliding window counter of Binance request weights.
+
+    Tracks every `REQUEST_WEIGHT` and `RAW_REQUESTS` limit advertised in
+    `exchangeInfo.rateLimits` (`ORDERS` limits only apply to order endpoints) and
+    blocks a request before it is sent, when sending it would exceed any of them,
+    instead of waiting for the server to answer with a 429.
+
+    The limiter is thread-safe, so it can be shared by a client used from several
+    threads and a `BinanceKlinesFetcher`.
+    """
+
+    def __init__(self, rate_limits: list[dict] | None = None):
+        self._lock = threading.Lock()
+        self.load(rate_limits or DEFAULT_RATE_LIMITS)
+
+    def load(self, rate_limits: list[dict]) -> None:
+        """Set the limits from a Binance `rateLimits` list, e.g.
+        {"rateLimitType": "REQUEST_WEIGHT", "interval": "MINUTE", "intervalNum": 1,
+         "limit": 6000}, which is tracked as `REQUEST_WEIGHT_1M`.
+        """
+        limits: dict[str, tuple[int, int]] = {}
+        for rl in rate_limits:
+            if rl["rateLimitType"] not in ("REQUEST_WEIGHT", "RAW_REQUESTS"):
+                continue
+            name = f"{rl['rateLimitType']}_{rl['intervalNum']}{rl['interval'][0]}"
+            span = rl["intervalNum"] * INTERVAL_SECONDS[rl["interval"]]
+            limits[name] = (span, rl["limit"])
+        with self._lock:
+            self.limits = limits
+            # (timestamp, cost) entries and their running total per limit, keeping
+            # what was already counted for limits that are still tracked
+            windows = getattr(self, "_windows", {})
+            self._windows: dict[str, deque[tuple[float, int]]] = {
+                name: windows.get(name, deque()) for name in self.limits
+            }
+            self._totals = {
+                name: sum(cost for _, cost in window)
+                for name, window in self._windows.items()
+            }
+
+    def delay(self, weight: int = 1) -> float:
+        """Seconds to wait before a request of `weight` fits in every window."""
+        with self._lock:
+            return self._delay(weight)
+
+    def record(self, weight: int = 1) -> None:
+        """Count a request of `weight` as sent."""
+        with self._lock:
+            self._record(weight)
+
+    def _reserve(self, weight: int) -> float:
+        """Count a request of `weight` if it fits now, otherwise return the seconds
+        to wait, checking and counting atomically across threads."""
+        with self._lock:
+            wait = self._delay(weight)
+            if wait <= 0:
+                self._record(weight)
+            return wait
+
+    def _delay(self, weight: int) -> float:
+        now = monotonic()
+        wait = 0.0
+        for name, (span, limit) in self.limits.items():
+            window = self._windows[name]
+            while window and window[0][0] <= now - span:
+                self._totals[name] -= window.popleft()[1]
+            cost = 1 if name.startswith("RAW_REQUESTS") else weight
+            if window and self._totals[name] + cost > limit:
+                wait = max(wait, window[0][0] + span - now)
+        return wait
+
+    def _record(self, weight: int) -> None:
+        now = monotonic()
+        for name in self.limits:
+            cost = 1 if name.startswith("RAW_REQUESTS") else weight
+            self._windows[name].append((now, cost))
+            self._totals[name] += cost
+
+    def wait_if_throttled(self, weight: int = 1) -> None:
+        """Block until a request of `weight` fits within the limits, then count it."""
+        while (wait := self._reserve(weight)) > 0:
+            sleep(wait)
+
+    async def async_wait_if_throttled(self, weight: int = 1) -> None:
+        """Async version of `wait_if_throttled`."""
+        while (wait := self._reserve(weight)) > 0:
+            await asyncio.sleep(wait)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from binanceRestClient.enums import Exchange
+from binanceRestClient.settings import EXCHANGE_SETTINGS
+
+try:
+    import picows
+except ImportError:  # optional, only needed by `BinanceWsClient`
+    picows = None
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # fall back to the (slower) stdlib json
+    from json import loads as _loads
+
+
+class _StreamListener(picows.WSListener if picows else object):
+    """Decode the text messages of a combined stream into the client's queue,
+    joining those fragmented over several frames."""
+
+    def __init__(self, queue: asyncio.Queue):
+        super().__init__()
+        self.queue = queue
+        self._fragments: list[bytes] = []
+
+    def on_ws_frame(self, transport, frame) -> None:
+        if frame.msg_type == picows.WSMsgType.TEXT and frame.fin:
+            self.queue.put_nowait(_loads(frame.get_payload_as_bytes()))
+        elif frame.msg_type == picows.WSMsgType.TEXT:
+            self._fragments = [frame.get_payload_as_bytes()]
+        elif frame.msg_type == picows.WSMsgType.CONTINUATION and self._fragments:
+            self._fragments.append(frame.get_payload_as_bytes())
+            if frame.fin:
+                self.queue.put_nowait(_loads(b"".join(self._fragments)))
+                self._fragments = []
+        elif frame.msg_type == picows.WSMsgType.PING:
+            transport.send_pong(frame.get_payload_as_bytes())
+        elif frame.msg_type == picows.WSMsgType.CLOSE:
+            transport.send_close(frame.get_close_code(), frame.get_close_message())
+            transport.disconnect()
+
+    def on_ws_disconnected(self, transport) -> None:
+        # wake up the consumer, so the iteration ends
+        self.queue.put_nowait(None)
+
+
+class BinanceWsClient:
+    """Receive Binance market streams over a single websocket (requires `picows`).
+
+    Subscribing once to a combined stream and getting the updates pushed is the
+    preferred way to follow prices at sub-second rates, instead of polling the REST
+    `ticker` and `klines` endpoints. Messages are yielded decoded, as
+    `{"stream": <name>, "data": <payload>}`:
+
+        async with BinanceWsClient(["btcusdt@ticker", "btcusdt@kline_1m"]) as ws:
+            async for msg in ws:
+                ...
+    """
+
+    def __init__(
+        self,
+        streams: list[str],
+        exchange: str = Exchange.BINANCE,
+        logger: logging.Logger | None = None,
+    ):
+        self._cls_name = self.__class__.__name__
+        if picows is None:
+            raise ImportError(f"{self._cls_name} requires `picows` to be installed.")
+        if exchange not in Exchange:
+            raise ValueError(f"Exchange {exchange} is not supported.")
+        ws_base_uri = EXCHANGE_SETTINGS[Exchange(exchange)].ws_base_uri
+        if not ws_base_uri:
+            raise ValueError(f"Exchange {exchange} has no websocket streams.")
+        if not streams:
+            raise ValueError("At least one stream is required.")
+        self.lgr = logger or logging.getLogger("BinanceWsClient")
+        self.streams = streams
+        self.url = f"{ws_base_uri}stream?streams={'/'.join(streams)}"
+        self._queue: asyncio.Queue | None = None
+        self._transport: picows.WSTransport | None = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, error_traceback):
+        await self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        if self._queue is None:
+            raise StopAsyncIteration
+        msg = await self._queue.get()
+        if msg is None:
+            raise StopAsyncIteration
+        return msg
+
+    @property
+    def cls_name(self) -> str:
+        return self._cls_name
+
+    async def connect(self) -> None:
+        """Open the websocket, if it isn't already open."""
+        if self._transport is not None and not self._transport.is_disconnected:
+            return
+        queue = self._queue = asyncio.Queue()
+        self.lgr.info(f"{self._cls_name}.connect - Connecting to {self.url}")
+        self._transport, _ = await picows.ws_connect(
+            lambda: _StreamListener(queue), self.url
+        )
+
+    async def close(self) -> None:
+        """Close the websocket and wait for the disconnect."""
+        if self._transport is None:
+            return
+        if not self._transport.is_disconnected:
+            self._transport.send_close(picows.WSCloseCode.OK)
+            self._transport.disconnect()
+        await self._transport.wait_disconnected()
+        self._transport = None
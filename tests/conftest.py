@@ -0,0 +1,22 @@
+from unittest.mock import patch
+
+import pytest
+
+from binanceRestClient.client import BinanceRestClient
+
+
+@pytest.fixture(scope="module")
+def client():
+    """A client built once per test module, over a mocked `requests.Session`."""
+    with patch("requests.Session"):
+        yield BinanceRestClient(api_key="test_key", api_secret="test_secret")
+
+
+@pytest.fixture(autouse=True)
+def reset_client(request):
+    """Reset the shared client's session mock and caches between tests."""
+    yield
+    if "client" in request.fixturenames:
+        client = request.getfixturevalue("client")
+        client.session.reset_mock(return_value=True, side_effect=True)
+        client.invalidate_cache()
@@ -0,0 +1,231 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+import pytest
+
+from binanceRestClient.async_tools import AIMDLimiter, BinanceKlinesFetcher
+
+
+def klines(close, close_time):
+    return {
+        "open_time": np.asarray(close_time, dtype=np.int64) - 1,
+        "open": np.asarray(close, dtype=np.float64),
+        "high": np.asarray(close, dtype=np.float64),
+        "low": np.asarray(close, dtype=np.float64),
+        "close": np.asarray(close, dtype=np.float64),
+        "close_time": np.asarray(close_time, dtype=np.int64),
+    }
+
+
+def test_fill_missing_pairs():
+    fetcher = BinanceKlinesFetcher(["ETH-USDT", "BTC-USDT", "BTC-ETH"], n_mins=5)
+    fetcher.responses = {
+        "ETH-USDT": klines([2.0, 4.0, 8.0], [10, 20, 30]),
+        "BTC-USDT": klines([6.0, 8.0], [11, 21]),
+        "BTC-ETH": {},
+    }
+    fetcher.fill_missing_pairs()
+    filled = fetcher.responses["BTC-ETH"]
+    assert filled.keys() == {"close", "close_time"}
+    np.testing.assert_array_equal(filled["close"], [3.0, 2.0])
+    np.testing.assert_array_equal(filled["close_time"], [10, 20])
+    assert filled["close_time"].dtype == np.int64
+
+
+def test_fill_missing_pairs_without_eth_usdt_data():
+    fetcher = BinanceKlinesFetcher(["ETH-USDT", "BTC-USDT", "BTC-ETH"], n_mins=5)
+    fetcher.responses = {
+        "ETH-USDT": {},
+        "BTC-USDT": klines([6.0], [11]),
+        "BTC-ETH": {},
+    }
+    fetcher.fill_missing_pairs()
+    assert fetcher.responses["BTC-ETH"] == {}
+
+
+def test_aimd_limiter_adjusts_within_bounds():
+    limiter = AIMDLimiter(initial=4, min_limit=2, max_limit=5, alpha=0.5, window=4)
+    limiter.on_success(0.1)
+    assert limiter.limit == 4.5
+    for _ in range(3):
+        limiter.on_success(0.1)
+    assert limiter.limit == 5  # clamped to max_limit
+    # a latency spike over the full window halves the limit
+    limiter.on_success(1.0)
+    assert limiter.limit == 2.5
+    limiter.on_error()
+    assert limiter.limit == 2  # clamped to min_limit
+    assert AIMDLimiter(initial=100, max_limit=8).limit == 8
+
+
+def test_aimd_limiter_pause():
+    limiter = AIMDLimiter()
+    slept = []
+
+    async def fake_sleep(delay):
+        slept.append(delay)
+
+    async def acquire_release():
+        await limiter.acquire()
+        await limiter.release()
+
+    with patch("binanceRestClient.async_tools.monotonic", return_value=100.0):
+        limiter.pause(5)
+        limiter.pause(2)  # a shorter pause doesn't shorten the current one
+        with patch("asyncio.sleep", fake_sleep):
+            asyncio.run(acquire_release())
+    assert slept == [5.0]
+
+
+def test_fetcher_backs_off_on_timeouts():
+    fetcher = BinanceKlinesFetcher(
+        ["ETH-USDT"], n_mins=5, pair_retries=2, init_backoff=0
+    )
+    limit = fetcher._limiter.limit
+
+    async def timeout(session, url):
+        raise asyncio.TimeoutError
+
+    fetcher._read = timeout
+    asyncio.run(fetcher.get_single_pair(None, "url", "ETH-USDT"))
+    assert fetcher.responses["ETH-USDT"] == {}
+    assert fetcher._limiter.limit == limit * 0.5**2
+
+
+def test_aimd_limiter_across_event_loops():
+    limiter = AIMDLimiter(initial=2, min_limit=1)
+
+    async def run():
+        async def hold():
+            async with limiter:
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(hold() for _ in range(4)))
+
+    # the limiter is reusable by later `asyncio.run` calls, on their own loop
+    asyncio.run(run())
+    asyncio.run(run())
+    assert limiter.pending == 0
+
+
+# the first session is left unclosed on purpose, as by a bare `asyncio.run` call
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+def test_session_is_rebuilt_per_event_loop():
+    fetcher = BinanceKlinesFetcher(["ETH-USDT"], n_mins=5)
+
+    async def get_session():
+        session = fetcher._get_session()
+        # the session is shared within a loop
+        assert fetcher._get_session() is session
+        return session
+
+    async def get_and_close_session():
+        session = await get_session()
+        await fetcher.close()
+        return session
+
+    first = asyncio.run(get_session())
+    second = asyncio.run(get_and_close_session())
+    assert second is not first
+    assert second.closed
+
+
+def test_duplicate_pairs_share_one_request():
+    fetcher = BinanceKlinesFetcher(
+        ["ETH-USDT", "ETH-USDT", "BTC-USDT"], fromTime=1, toTime=2
+    )
+    urls = []
+
+    async def read(session, url):
+        urls.append(url)
+        await asyncio.sleep(0.01)  # keep the first download in flight
+        return 200, {}, b'[[0, "1", "2", "0.5", "1.5", "9", 100, "0"]]'
+
+    async def fetch():
+        async with fetcher:
+            await fetcher.fetch_pairs_klines()
+
+    fetcher._read = read
+    asyncio.run(fetch())
+    assert len(urls) == 2  # one per distinct pair
+    eth_usdt = fetcher.responses["ETH-USDT"]
+    assert eth_usdt.keys() == {
+        "open_time",
+        "open",
+        "high",
+        "low",
+        "close",
+        "close_time",
+    }
+    np.testing.assert_array_equal(eth_usdt["close"], [1.5])
+    np.testing.assert_array_equal(eth_usdt["open_time"], [0])
+    assert eth_usdt["open_time"].dtype == np.int64
+
+    # concurrent callers of the same url, e.g. two names of a pair, get one result
+    urls.clear()
+
+    async def fetch_twice():
+        await asyncio.gather(
+            fetcher.get_single_pair(None, "url", "ETH-USDT"),
+            fetcher.get_single_pair(None, "url", "ETHUSDT"),
+        )
+
+    asyncio.run(fetch_twice())
+    assert urls == ["url"]
+    assert fetcher.responses["ETHUSDT"] is fetcher.responses["ETH-USDT"]
+    assert fetcher._inflight == {}
+
+
+def test_klines_urls_follow_the_pairs():
+    pairs = ["ETH-USDT"]
+    fetcher = BinanceKlinesFetcher(pairs, fromTime=1, toTime=2)
+    urls = fetcher.create_klines_urls(1, 2)
+    assert fetcher.create_klines_urls(1, 2) is urls
+    # pairs added to the caller's list, or replaced, get their urls too
+    pairs.append("BTC-USDT")
+    assert [url.split("&")[0] for url in fetcher.create_klines_urls(1, 2)] == [
+        f"{fetcher.base_url}?symbol=ETHUSDT",
+        f"{fetcher.base_url}?symbol=BTCUSDT",
+    ]
+    fetcher.pairs = ["XRP-USDT"]
+    assert fetcher.create_klines_urls(1, 2) == [
+        f"{fetcher.base_url}?symbol=XRPUSDT&interval=1s&startTime=1&endTime=2"
+    ]
+
+
+def test_http2_fetcher():
+    pytest.importorskip("httpx")
+    fetcher = BinanceKlinesFetcher(
+        ["ETH-USDT"], fromTime=1, toTime=2, n_mins=None, http2=True
+    )
+    with patch("binanceRestClient.async_tools.httpx.AsyncClient") as client_cls:
+        session = client_cls.return_value
+        session.is_closed = False
+        session.get = AsyncMock(
+            return_value=Mock(
+                status_code=200,
+                headers={},
+                content=b'[[0, "1", "2", "0.5", "1.5", "9", 100, "0"]]',
+            )
+        )
+
+        async def aclose():
+            session.is_closed = True
+
+        session.aclose = AsyncMock(side_effect=aclose)
+
+        async def fetch():
+            async with fetcher:
+                assert not fetcher._session_closed
+                return await fetcher.fetch_pairs_klines()
+
+        klines = asyncio.run(fetch())
+    assert client_cls.call_args.kwargs["http2"] is True
+    session.get.assert_awaited_once_with(
+        f"{fetcher.base_url}?symbol=ETHUSDT&interval=1s&startTime=1&endTime=2",
+        timeout=None,
+    )
+    np.testing.assert_array_equal(klines["ETH-USDT"]["close"], [1.5])
+    session.aclose.assert_awaited_once()
+    assert fetcher._session_closed
@@ -1,55 +1,362 @@
-from unittest.mock import patch
+import threading
+from unittest.mock import Mock, patch
 
-from binanceRestClient.client import BinanceRestClient
+import pytest
 
+from binanceRestClient import client as client_module
+from binanceRestClient.client import BinanceRestClient, get_client
+from binanceRestClient.enums import Exchange
+from binanceRestClient.exceptions import (
+    AlreadyStoppedError,
+    BinanceBackpressureException,
+)
 
-@patch("requests.Session")
-def test_init_session(mock_session):
-    client = BinanceRestClient(api_key="test_key", api_secret="test_secret")
+
+@pytest.mark.parametrize(
+    "transport, session_cls",
+    [("requests", "requests.Session"), ("httpx", "httpx.Client")],
+)
+def test_init_session(transport, session_cls):
+    pytest.importorskip(transport)
+    with patch(session_cls) as mock_session:
+        client = BinanceRestClient(
+            api_key="test_key", api_secret="test_secret", transport=transport
+        )
     mock_session.assert_called_once()
+    assert client.session is mock_session.return_value
     assert client.api_key == "test_key"
     assert client.api_secret == "test_secret"
 
 
-@patch("requests.Session")
-def test_get_exchange_info(mock_session):
-    client = BinanceRestClient(api_key="test_key", api_secret="test_secret")
-    mock_session.return_value.get.return_value.json.return_value = {"test": "data"}
+def test_get_exchange_info(client):
+    client.session.get.return_value.status_code = 200
+    client.session.get.return_value.content = b'{"test": "data"}'
     response = client.get_exchange_info()
-    mock_session.return_value.get.assert_called_once_with(
-        client.api_url + "/v3/exchangeInfo"
+    client.session.get.assert_called_once_with(
+        client.api_url + "/v3/exchangeInfo", timeout=10
     )
     assert response == {"test": "data"}
 
 
-@patch("requests.Session")
-def test_get_symbol_info(mock_session):
-    client = BinanceRestClient(api_key="test_key", api_secret="test_secret")
-    mock_session.return_value.get.return_value.json.return_value = {
-        "symbols": [{"symbol": "BTCUSDT", "status": "TRADING"}]
-    }
-    response = client.get_symbol_info("BTCUSDT")
-    mock_session.return_value.get.assert_called_once_with(
-        client.api_url + "/v3/exchangeInfo"
+@pytest.mark.parametrize(
+    "method, path", [("get_ticker", "ticker/price"), ("get_24hr_ticker", "ticker/24hr")]
+)
+def test_ticker_with_symbols_list(client, method, path):
+    client.session.get.return_value.status_code = 200
+    client.session.get.return_value.content = b"[]"
+    assert getattr(client, method)(symbols=["BTCUSDT", "ETHUSDT"]) == []
+    client.session.get.assert_called_once_with(
+        f"{client.api_url}/v3/{path}?symbols=%5B%22BTCUSDT%22%2C%22ETHUSDT%22%5D",
+        timeout=10,
+    )
+
+
+def test_get_exchange_info_with_list_params(client):
+    client.session.get.return_value.status_code = 200
+    client.session.get.return_value.content = b'{"symbols": []}'
+    assert client.get_exchange_info(symbols=["BTCUSDT", "ETHUSDT"]) == {"symbols": []}
+    # the list is sent as a JSON array, and the response cached per symbols
+    client.get_exchange_info(symbols=["BTCUSDT", "ETHUSDT"])
+    client.session.get.assert_called_once_with(
+        client.api_url + "/v3/exchangeInfo?symbols=%5B%22BTCUSDT%22%2C%22ETHUSDT%22%5D",
+        timeout=10,
+    )
+
+
+def exchange_info_response(status_code=200, etag=None, content=b'{"symbols": []}'):
+    headers = {"ETag": etag} if etag else {}
+    return Mock(status_code=status_code, headers=headers, content=content)
+
+
+def test_get_exchange_info_revalidates_with_etag(client):
+    client.session.get.side_effect = [
+        exchange_info_response(etag='"v1"'),
+        exchange_info_response(304),  # without an ETag header
+        exchange_info_response(304),
+    ]
+    first = client.get_exchange_info()
+    assert client.get_exchange_info(refresh=True) is first
+    assert client.get_exchange_info(refresh=True) is first
+    # the stored ETag is kept by a 304 that omits it
+    for call in client.session.get.call_args_list[1:]:
+        assert call.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+def test_get_exchange_info_persists_to_disk(tmp_path):
+    with patch("requests.Session"):
+        client = BinanceRestClient(exchange_info_cache_dir=tmp_path)
+    client.session.get.return_value = exchange_info_response(etag='"v1"')
+    assert client.get_exchange_info() == {"symbols": []}
+    assert list(tmp_path.iterdir()) == [client._exchange_info_path()]
+
+    # a new client revalidates the persisted response instead of downloading it
+    with patch("requests.Session"):
+        restarted = BinanceRestClient(exchange_info_cache_dir=tmp_path)
+    restarted.session.get.return_value = exchange_info_response(304)
+    assert restarted.get_exchange_info() == {"symbols": []}
+    restarted.session.get.assert_called_once_with(
+        restarted.api_url + "/v3/exchangeInfo",
+        timeout=10,
+        headers={"If-None-Match": '"v1"'},
+    )
+
+
+def test_get_symbol_info(client):
+    client.session.get.return_value.status_code = 200
+    client.session.get.return_value.content = (
+        b'{"symbols": [{"symbol": "BTCUSDT", "status": "TRADING"}, '
+        b'{"symbol": "ETHUSDT", "status": "BREAK"}]}'
     )
+    response = client.get_symbol_info("BTCUSDT")
     assert response == {"symbol": "BTCUSDT", "status": "TRADING"}
+    # later lookups are served from the cached symbol index
+    assert client.get_symbol_info("ethusdt") == {"symbol": "ETHUSDT", "status": "BREAK"}
+    assert client.get_symbol_info("XRPUSDT") is None
+    client.session.get.assert_called_once_with(
+        client.api_url + "/v3/exchangeInfo", timeout=10
+    )
 
 
-@patch("requests.Session")
-def test_ping(mock_session):
-    client = BinanceRestClient(api_key="test_key", api_secret="test_secret")
-    mock_session.return_value.get.return_value.json.return_value = {}
-    response = client.ping()
-    mock_session.return_value.get.assert_called_once_with(client.api_url + "/v3/ping")
-    assert response == {}
+def test_ping(client):
+    client.session.get.return_value.status_code = 200
+    client.session.get.return_value.content = b"{}"
+    assert client.ping() is True
+    client.session.get.assert_called_once_with(client.api_url + "/v3/ping", timeout=10)
 
 
-@patch("requests.Session")
-def test_get_server_time(mock_session):
-    client = BinanceRestClient(api_key="test_key", api_secret="test_secret")
-    mock_session.return_value.get.return_value.json.return_value = {
-        "serverTime": 1234567890
-    }
+def test_ping_unreachable(client):
+    client.session.get.return_value.status_code = 503
+    client.session.get.return_value.content = b"<html>Service Unavailable</html>"
+    # only the status code is checked, the body isn't parsed nor raised for
+    assert client.ping() is False
+
+
+def test_get_server_time(client):
+    client.session.get.return_value.status_code = 200
+    client.session.get.return_value.content = b'{"serverTime": 1234567890}'
     response = client.get_server_time()
-    mock_session.return_value.get.assert_called_once_with(client.api_url + "/v3/time")
-    assert response == {"serverTime": 1234567890}
+    client.session.get.assert_called_once_with(client.api_url + "/v3/time", timeout=10)
+    assert response == 1234567890
+
+
+def test_stream_keepalive_reuses_url(client):
+    client.session.put.return_value.status_code = 200
+    client.session.put.return_value.content = b"{}"
+    assert client.stream_keepalive("test_listen_key") == {}
+    client.stream_keepalive("test_listen_key")
+    first, second = client.session.put.call_args_list
+    assert first.args[0] == (
+        client.api_url + "/v3/userDataStream?listenKey=test_listen_key"
+    )
+    # the encoded url is built once and reused for the same listen key
+    assert second.args[0] is first.args[0]
+    assert "data" not in second.kwargs
+
+
+def test_ticker_cache_hit_and_expiry(client):
+    client.session.get.return_value.status_code = 200
+    client.session.get.return_value.content = b'{"symbol": "BTCUSDT", "price": "1"}'
+    with patch("binanceRestClient.client.monotonic", return_value=100.0) as clock:
+        first = client.get_ticker(symbol="BTCUSDT")
+        # each hit is a copy, mutating it leaves the cached response intact
+        first["price"] = "0"
+        assert client.get_ticker(symbol="BTCUSDT") == {
+            "symbol": "BTCUSDT",
+            "price": "1",
+        }
+        assert client.session.get.call_count == 1
+        clock.return_value += client.CACHE_TTL["ticker/price"]
+        client.get_ticker(symbol="BTCUSDT")
+    assert client.session.get.call_count == 2
+
+
+def test_invalidate_cache_of_path(client):
+    client.session.get.return_value.status_code = 200
+    client.session.get.return_value.content = b'{"symbol": "BTCUSDT", "price": "1"}'
+    client.get_ticker(symbol="BTCUSDT")
+    client.invalidate_cache("ticker/bookTicker")
+    client.get_ticker(symbol="BTCUSDT")
+    assert client.session.get.call_count == 1
+    client.invalidate_cache("ticker/price")
+    client.get_ticker(symbol="BTCUSDT")
+    assert client.session.get.call_count == 2
+
+
+def test_unhashable_params_are_not_cached(client):
+    client.session.get.return_value.status_code = 200
+    client.session.get.return_value.content = b"[]"
+    client._get("ticker/price", data={"symbols": ["BTCUSDT"]})
+    client._get("ticker/price", data={"symbols": ["BTCUSDT"]})
+    assert client.session.get.call_count == 2
+    assert client._cache == {}
+
+
+def test_stopped_client_raises_on_cache_hit():
+    with patch("requests.Session"):
+        client = BinanceRestClient()
+    client.session.get.return_value.status_code = 200
+    client.session.get.return_value.content = b'{"symbols": []}'
+    client.get_ticker(symbol="BTCUSDT")
+    client.get_exchange_info()
+    client.stop()
+    with pytest.raises(AlreadyStoppedError):
+        client.get_ticker(symbol="BTCUSDT")
+    with pytest.raises(AlreadyStoppedError):
+        client.get_exchange_info()
+    assert client.session.get.call_count == 2
+
+
+def test_unsigned_get_url(client):
+    client.session.get.return_value.status_code = 200
+    client.session.get.return_value.content = b"[]"
+    client.get_klines(symbol="BTCUSDT", interval="1m", limit=1.0)
+    client.get_klines(symbol="BTCUSDT", interval="1m", limit=1)
+    float_call, int_call = client.session.get.call_args_list
+    # only exact str/int params are encoded into the url, others by the session
+    assert float_call.args[0] == client.api_url + "/v3/klines"
+    assert float_call.kwargs["params"] == {
+        "symbol": "BTCUSDT",
+        "interval": "1m",
+        "limit": 1.0,
+    }
+    assert int_call.args[0] == (
+        client.api_url + "/v3/klines?symbol=BTCUSDT&interval=1m&limit=1"
+    )
+    assert "params" not in int_call.kwargs
+
+
+def test_backpressure_fail_rejects_past_max_queue():
+    with patch("requests.Session"):
+        client = BinanceRestClient(backpressure="fail", max_queue=1)
+    sent, release = threading.Event(), threading.Event()
+
+    def slow_get(uri, **kwargs):
+        sent.set()
+        release.wait(5)
+        return Mock(status_code=200, content=b'{"serverTime": 1234567890}')
+
+    client.session.get.side_effect = slow_get
+    results = []
+    pending = threading.Thread(target=lambda: results.append(client.get_server_time()))
+    pending.start()
+    assert sent.wait(5)
+    # the pending request fills the queue, so the next one is rejected at once
+    with pytest.raises(BinanceBackpressureException) as exc:
+        client.ping()
+    assert exc.value.status_code == 429
+    release.set()
+    pending.join(5)
+    assert results == [1234567890]
+    assert client.ping() is True
+    assert client.backpressure_rejects == 1
+
+
+def test_kline_fetcher_shares_the_pending_queue():
+    with patch("requests.Session"):
+        client = BinanceRestClient(backpressure="fail", max_queue=1)
+    fetch = client.kline_fetcher("BTCUSDT", "1m", limit=10)
+    sent, release = threading.Event(), threading.Event()
+
+    def slow_get(uri, **kwargs):
+        sent.set()
+        release.wait(5)
+        return Mock(status_code=200, content=b"[[1, 2]]")
+
+    client.session.get.side_effect = slow_get
+    results = []
+    pending = threading.Thread(target=lambda: results.append(fetch()))
+    pending.start()
+    assert sent.wait(5)
+    # the pending fetch counts against `max_queue` like any other request
+    with pytest.raises(BinanceBackpressureException):
+        client.ping()
+    release.set()
+    pending.join(5)
+    assert results == [[[1, 2]]]
+    assert client._pending == 0
+    assert client.session.get.call_args.args[0] == (
+        client.api_url + "/v3/klines?symbol=BTCUSDT&interval=1m&limit=10"
+    )
+
+
+def test_batch_merges_symbol_ops(client):
+    client.session.get.return_value.status_code = 200
+    client.session.get.return_value.content = (
+        b'[{"symbol": "BTCUSDT", "price": "1"}, {"symbol": "ETHUSDT", "price": "2"}]'
+    )
+    client.session.get.return_value.headers = {}
+    results = client.batch(
+        [
+            ("ticker", {"symbol": "ETHUSDT"}),
+            ("ticker", {"symbols": ["BTCUSDT", "ETHUSDT", "XRPUSDT"]}),
+            ("ticker", {"symbol": "BTCUSDT"}),
+        ]
+    )
+    # one request, with the symbols of every op once
+    client.session.get.assert_called_once_with(
+        client.api_url
+        + "/v3/ticker/price?symbols=%5B%22ETHUSDT%22%2C%22BTCUSDT%22%2C%22XRPUSDT%22%5D",
+        timeout=10,
+    )
+    assert results == [
+        {"symbol": "ETHUSDT", "price": "2"},
+        [{"symbol": "BTCUSDT", "price": "1"}, {"symbol": "ETHUSDT", "price": "2"}],
+        {"symbol": "BTCUSDT", "price": "1"},
+    ]
+
+
+def test_batch_sends_encoded_symbols_as_is(client):
+    client.session.get.return_value.status_code = 200
+    client.session.get.return_value.content = b'[{"symbol": "BTCUSDT"}]'
+    result = client.batch([("ticker", {"symbols": '["BTCUSDT"]'})])
+    assert result == [[{"symbol": "BTCUSDT"}]]
+    client.session.get.assert_called_once_with(
+        client.api_url + "/v3/ticker/price?symbols=%5B%22BTCUSDT%22%5D", timeout=10
+    )
+
+
+@pytest.mark.parametrize("name", ["stop", "set_credentials", "batch", "ticker_"])
+def test_batch_rejects_non_read_ops(client, name):
+    with pytest.raises(ValueError):
+        client.batch([(name, {})])
+    assert client.sigterm is False
+    client.session.get.assert_not_called()
+
+
+@pytest.fixture
+def shared_clients():
+    """Start `get_client` tests from no shared clients, over mocked sessions."""
+    with patch("requests.Session"), patch.dict(client_module._CLIENTS, clear=True):
+        yield
+
+
+@pytest.mark.usefixtures("shared_clients")
+def test_get_client_reuses_the_client():
+    shared = get_client(api_key="key", api_secret="secret")
+    assert get_client(api_key="key", api_secret="secret") is shared
+    # other arguments for the same client are rejected, not silently ignored
+    with pytest.raises(ValueError):
+        get_client(api_key="key", api_secret="other_secret")
+    with pytest.raises(ValueError):
+        get_client(api_key="key", api_secret="secret", transport="httpx")
+
+
+@pytest.mark.usefixtures("shared_clients")
+def test_get_client_replaces_a_stopped_client():
+    stopped = get_client()
+    stopped.stop()
+    replaced = get_client()
+    assert replaced is not stopped
+    assert replaced.sigterm is False
+    assert get_client() is replaced
+
+
+@pytest.mark.usefixtures("shared_clients")
+def test_get_client_per_exchange_and_api_key():
+    shared = get_client()
+    assert get_client(Exchange.BINANCE_TESTNET) is not shared
+    assert get_client(Exchange.BINANCE_TESTNET).exchange == Exchange.BINANCE_TESTNET
+    assert get_client(api_key="key", api_secret="secret") is not shared
+    assert len(client_module._CLIENTS) == 3
+    with pytest.raises(ValueError):
+        get_client("unknown")
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from binanceRestClient.rate_limits import RateLimiter
+
+RATE_LIMITS = [
+    {
+        "rateLimitType": "REQUEST_WEIGHT",
+        "interval": "MINUTE",
+        "intervalNum": 1,
+        "limit": 10,
+    },
+    {
+        "rateLimitType": "RAW_REQUESTS",
+        "interval": "SECOND",
+        "intervalNum": 10,
+        "limit": 3,
+    },
+    {"rateLimitType": "ORDERS", "interval": "SECOND", "intervalNum": 10, "limit": 1},
+]
+
+
+@pytest.fixture
+def clock():
+    """A controllable `monotonic`, starting at 1000 seconds."""
+    now = [1000.0]
+    with patch("binanceRestClient.rate_limits.monotonic", lambda: now[0]):
+        yield now
+
+
+def test_load_tracks_weight_and_raw_request_limits():
+    limiter = RateLimiter(RATE_LIMITS)
+    assert limiter.limits == {
+        "REQUEST_WEIGHT_1M": (60, 10),
+        "RAW_REQUESTS_10S": (10, 3),
+    }
+
+
+def test_delay_until_the_oldest_entry_expires(clock):
+    limiter = RateLimiter(RATE_LIMITS[:1])
+    limiter.record(6)
+    clock[0] += 20
+    limiter.record(4)
+    assert limiter.delay(1) == 40  # the first 6 expire 60s after being sent
+    clock[0] += 40
+    assert limiter.delay(1) == 0
+    assert limiter._totals["REQUEST_WEIGHT_1M"] == 4
+
+
+def test_raw_requests_count_one_per_request(clock):
+    limiter = RateLimiter(RATE_LIMITS[1:2])
+    for _ in range(3):
+        limiter.record(50)
+    assert limiter.delay(1) == 10
+    clock[0] += 10
+    assert limiter.delay(50) == 0
+
+
+def test_reload_keeps_counted_entries(clock):
+    limiter = RateLimiter(RATE_LIMITS[:1])
+    limiter.record(8)
+    # the same limit keeps its window, a new one starts empty
+    limiter.load(RATE_LIMITS[:2])
+    assert limiter._totals == {"REQUEST_WEIGHT_1M": 8, "RAW_REQUESTS_10S": 0}
+    assert limiter.delay(3) == 60
+
+
+def test_wait_if_throttled_sleeps_then_records(clock):
+    limiter = RateLimiter(RATE_LIMITS[:1])
+    limiter.record(10)
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        clock[0] += seconds
+
+    with patch("binanceRestClient.rate_limits.sleep", sleep):
+        limiter.wait_if_throttled(2)
+    assert slept == [60]
+    assert limiter._totals["REQUEST_WEIGHT_1M"] == 2
+
+
+def test_reserve_is_atomic_across_threads(clock):
+    limiter = RateLimiter([{**RATE_LIMITS[0], "limit": 500}])
+
+    def reserve(_):
+        return sum(limiter._reserve(1) == 0 for _ in range(100))
+
+    with ThreadPoolExecutor(8) as pool:
+        reserved = sum(pool.map(reserve, range(8)))
+    # with the clock frozen, exactly the limit fits, however the threads interleave
+    assert reserved == 500
+    window = limiter._windows["REQUEST_WEIGHT_1M"]
+    assert limiter._totals["REQUEST_WEIGHT_1M"] == sum(c for _, c in window) == 500
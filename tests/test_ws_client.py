@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+picows = pytest.importorskip("picows")
+
+from binanceRestClient.ws_client import BinanceWsClient  # noqa: E402
+
+
+class StreamServer(picows.WSListener):
+    """Send a whole and a fragmented message, then close the websocket."""
+
+    def on_ws_connected(self, transport):
+        transport.send(picows.WSMsgType.TEXT, b'{"stream": "a", "data": 1}')
+        transport.send(picows.WSMsgType.TEXT, b'{"stream": "b",', fin=False)
+        transport.send(picows.WSMsgType.CONTINUATION, b' "data": ', fin=False)
+        transport.send(picows.WSMsgType.CONTINUATION, b"[2, 3]}")
+        transport.send_close(picows.WSCloseCode.OK)
+
+    def on_ws_frame(self, transport, frame):
+        if frame.msg_type == picows.WSMsgType.CLOSE:
+            transport.disconnect()
+
+
+def test_ws_client_yields_messages_until_closed():
+    async def receive():
+        server = await picows.ws_create_server(
+            lambda request: StreamServer(), "127.0.0.1", 0
+        )
+        port = server.sockets[0].getsockname()[1]
+        try:
+            ws = BinanceWsClient(["btcusdt@ticker"])
+            ws.url = f"ws://127.0.0.1:{port}/"
+            async with ws:
+                return [msg async for msg in ws]
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    messages = asyncio.run(asyncio.wait_for(receive(), 5))
+    assert messages == [{"stream": "a", "data": 1}, {"stream": "b", "data": [2, 3]}]
+
+
+def test_ws_client_stream_url():
+    ws = BinanceWsClient(["btcusdt@ticker", "btcusdt@kline_1m"])
+    assert ws.url.endswith("stream?streams=btcusdt@ticker/btcusdt@kline_1m")
+    with pytest.raises(ValueError):
+        BinanceWsClient([])